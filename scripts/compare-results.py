@@ -4,15 +4,66 @@ Compare validation results across multiple tools.
 Usage: compare-results.py <results-dir> [output-json-file]
 """
 
+import io
 import json
+import mmap
+import re
 import sys
 import os
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List, Set, Tuple, Any
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple, Any
 from difflib import SequenceMatcher
 from datetime import datetime
 
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    # scipy is optional; without it matches are assigned greedily
+    linear_sum_assignment = None
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    # rapidfuzz is optional; without it difflib is used for similarity
+    fuzz = None
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; without it the stdlib json module is used
+    orjson = None
+
+try:
+    import re2
+except ImportError:
+    # google-re2 is optional; it scrubs file paths in guaranteed linear time
+    re2 = None
+
+YAML_PATH_RE = (re2 or re).compile(r'[a-zA-Z0-9_\-/]+\.ya?ml')
+
+# Result directories with at least this many files are parsed in parallel
+PARALLEL_LOAD_MIN_FILES = 1024
+
+# Corpora with at least this many files are compared in parallel
+PARALLEL_COMPARE_MIN_FILES = 512
+
+# Result files at least this large are memory-mapped when parsed with orjson
+MMAP_MIN_BYTES = 1 << 20
+
+# Per-file errors of one tool as parallel columns: (errors, locations, message ids)
+ErrorColumns = Tuple[List[Dict[str, Any]], List[Tuple[str, int, int]], List[int]]
+EMPTY_COLUMNS: ErrorColumns = ([], [], [])
+
+# Normalized messages interned to integer ids, shared across tools and files
+MESSAGE_IDS: Dict[str, int] = {}
+MESSAGES_BY_ID: List[str] = []
+
+# Similarity of already scored message id pairs, per similarity threshold
+PAIR_SCORES: Dict[float, Dict[Tuple[int, int], float]] = {}
+
 
 def normalize_error_location(diagnostic: Dict[str, Any], file_path: str) -> Tuple[str, int, int]:
     """Normalize error location to (file, line, column) tuple."""
@@ -34,19 +85,73 @@ def normalize_error_location(diagnostic: Dict[str, Any], file_path: str) -> Tupl
     return (file_path, line, column)
 
 
+@lru_cache(maxsize=65536)
 def normalize_error_message(message: str) -> str:
     """Normalize error message for comparison."""
     # Lowercase and remove extra whitespace
     normalized = ' '.join(message.lower().split())
     # Remove file paths (they vary)
-    import re
-    normalized = re.sub(r'[a-zA-Z0-9_\-/]+\.ya?ml', '<file>', normalized)
+    normalized = YAML_PATH_RE.sub('<file>', normalized)
     return normalized
 
 
-def similarity_score(msg1: str, msg2: str) -> float:
-    """Calculate similarity between two error messages (0.0 to 1.0)."""
-    return SequenceMatcher(None, msg1, msg2).ratio()
+def similarity_score(msg1: str, msg2: str, score_cutoff: float = 0.0) -> float:
+    """
+    Calculate similarity between two error messages (0.0 to 1.0).
+    Scores below score_cutoff may be reported as 0.0.
+    """
+    if fuzz is not None:
+        return fuzz.ratio(msg1, msg2, score_cutoff=score_cutoff * 100) / 100.0
+    
+    # Cheap upper bounds first (length, then character multiset) so only
+    # pairs that could clear the cutoff pay for the full ratio
+    total = len(msg1) + len(msg2)
+    if total and 2.0 * min(len(msg1), len(msg2)) / total < score_cutoff:
+        return 0.0
+    matcher = SequenceMatcher(None, msg1, msg2)
+    if matcher.quick_ratio() < score_cutoff:
+        return 0.0
+    return matcher.ratio()
+
+
+def intern_message(message: str) -> int:
+    """Return the integer id of a normalized message, assigning one if new."""
+    message_id = MESSAGE_IDS.get(message)
+    if message_id is None:
+        message_id = len(MESSAGES_BY_ID)
+        MESSAGE_IDS[message] = message_id
+        MESSAGES_BY_ID.append(message)
+    return message_id
+
+
+def load_message_pool(messages: List[str]) -> None:
+    """Install the parent's interned messages in a worker process."""
+    MESSAGES_BY_ID[:] = messages
+    MESSAGE_IDS.clear()
+    MESSAGE_IDS.update((message, message_id) for message_id, message in enumerate(messages))
+
+
+def error_columns(diagnostics: List[Dict[str, Any]], file_path: str) -> ErrorColumns:
+    """
+    Filter diagnostics to only errors (not warnings/info) and extract their
+    normalized locations and interned message ids in a single pass.
+    Returns: (errors, locations, message_ids)
+    """
+    errors = []
+    locations = []
+    message_ids = []
+    for e in diagnostics:
+        # Most diagnostics are missing a severity or say exactly 'error';
+        # only other values need the case-insensitive comparison
+        severity = e.get('severity')
+        if severity is not None and severity != 'error' and not (
+            isinstance(severity, str) and severity.lower() == 'error'
+        ):
+            continue
+        errors.append(e)
+        locations.append(normalize_error_location(e, file_path))
+        message_ids.append(intern_message(normalize_error_message(e.get('message', ''))))
+    return errors, locations, message_ids
 
 
 def match_errors(
@@ -59,46 +164,68 @@ def match_errors(
     Match errors between two tools.
     Returns: (common_errors, unique_to_1, unique_to_2)
     """
+    columns1 = (
+        errors1,
+        [normalize_error_location(e, file_path) for e in errors1],
+        [intern_message(normalize_error_message(e.get('message', ''))) for e in errors1]
+    )
+    columns2 = (
+        errors2,
+        [normalize_error_location(e, file_path) for e in errors2],
+        [intern_message(normalize_error_message(e.get('message', ''))) for e in errors2]
+    )
+    return match_error_columns(columns1, columns2, similarity_threshold)
+
+
+def match_error_columns(
+    columns1: ErrorColumns,
+    columns2: ErrorColumns,
+    similarity_threshold: float = 0.7
+) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    Match errors between two tools given pre-normalized columns.
+    Returns: (common_errors, unique_to_1, unique_to_2)
+    """
+    errors1, locs1, mids1 = columns1
+    errors2, locs2, mids2 = columns2
+    pair_scores = PAIR_SCORES.setdefault(similarity_threshold, {})
+    
+    # Score every pair that matches on location (same file, line within 2)
+    scores = {}
+    for idx1, idx2 in location_candidates(locs1, locs2):
+        mid1 = mids1[idx1]
+        mid2 = mids2[idx2]
+        if mid1 == mid2:
+            # Identical messages need no similarity scoring
+            msg_score = 1.0
+        else:
+            # Message pairs repeat across files; score each only once
+            msg_score = pair_scores.get((mid1, mid2))
+            if msg_score is None:
+                msg_score = similarity_score(
+                    MESSAGES_BY_ID[mid1], MESSAGES_BY_ID[mid2], similarity_threshold
+                )
+                pair_scores[(mid1, mid2)] = msg_score
+        if msg_score >= similarity_threshold:
+            scores[(idx1, idx2)] = msg_score
+    
+    matched_indices_1 = set()
     matched_indices_2 = set()
     common = []
-    unique_1 = []
     
-    for err1 in errors1:
-        loc1 = normalize_error_location(err1, file_path)
-        msg1 = normalize_error_message(err1.get('message', ''))
-        
-        best_match = None
-        best_score = 0.0
-        best_idx = -1
-        
-        for idx, err2 in enumerate(errors2):
-            if idx in matched_indices_2:
-                continue
-            
-            loc2 = normalize_error_location(err2, file_path)
-            msg2 = normalize_error_message(err2.get('message', ''))
-            
-            # Check location match (same file and line)
-            location_match = loc1[0] == loc2[0] and abs(loc1[1] - loc2[1]) <= 2
-            
-            # Check message similarity
-            msg_score = similarity_score(msg1, msg2)
-            
-            # Combined score
-            if location_match and msg_score > best_score:
-                best_score = msg_score
-                best_match = err2
-                best_idx = idx
-        
-        if best_match and best_score >= similarity_threshold:
-            common.append({
-                'tool1': err1,
-                'tool2': best_match,
-                'similarity': best_score
-            })
-            matched_indices_2.add(best_idx)
-        else:
-            unique_1.append(err1)
+    for idx1, idx2, score in assign_matches(scores):
+        common.append({
+            'tool1': errors1[idx1],
+            'tool2': errors2[idx2],
+            'similarity': score
+        })
+        matched_indices_1.add(idx1)
+        matched_indices_2.add(idx2)
+    
+    unique_1 = [
+        err1 for idx, err1 in enumerate(errors1)
+        if idx not in matched_indices_1
+    ]
     
     # Errors unique to tool 2
     unique_2 = [
@@ -109,46 +236,232 @@ def match_errors(
     return common, unique_1, unique_2
 
 
+def location_candidates(
+    locs1: List[Tuple[str, int, int]],
+    locs2: List[Tuple[str, int, int]]
+) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (index_1, index_2) for errors in the same file within 2 lines.
+    Integer lines are bucketed so candidates are a hash lookup; any other
+    numeric line (e.g. 3.0 or 3.5 from JSON) falls back to checking every pair.
+    """
+    if all(isinstance(loc[1], int) for loc in locs1) and all(isinstance(loc[1], int) for loc in locs2):
+        by_location = defaultdict(list)
+        for idx2, loc2 in enumerate(locs2):
+            by_location[(loc2[0], loc2[1])].append(idx2)
+        
+        for idx1, loc1 in enumerate(locs1):
+            for line in range(loc1[1] - 2, loc1[1] + 3):
+                for idx2 in by_location.get((loc1[0], line), ()):
+                    yield idx1, idx2
+        return
+    
+    for idx1, loc1 in enumerate(locs1):
+        for idx2, loc2 in enumerate(locs2):
+            if loc1[0] == loc2[0] and abs(loc1[1] - loc2[1]) <= 2:
+                yield idx1, idx2
+
+
+def assign_matches(scores: Dict[Tuple[int, int], float]) -> List[Tuple[int, int, float]]:
+    """
+    Pick a one-to-one assignment from scored candidate pairs.
+    Uses an optimal (Hungarian) assignment when scipy is available,
+    otherwise greedily takes the best remaining match for each error.
+    Returns: [(index_1, index_2, score)] ordered by index_1
+    """
+    if not scores:
+        return []
+    
+    if linear_sum_assignment is None:
+        return greedy_matches(scores)
+    
+    # Only rows/columns with at least one candidate take part
+    rows = sorted({idx1 for idx1, _ in scores})
+    cols = sorted({idx2 for _, idx2 in scores})
+    row_pos = {idx1: pos for pos, idx1 in enumerate(rows)}
+    col_pos = {idx2: pos for pos, idx2 in enumerate(cols)}
+    
+    # Non-candidate pairs keep cost 1.0 and are discarded after assignment
+    cost = [[1.0] * len(cols) for _ in rows]
+    for (idx1, idx2), score in scores.items():
+        cost[row_pos[idx1]][col_pos[idx2]] = 1.0 - score
+    
+    row_ind, col_ind = linear_sum_assignment(cost)
+    
+    pairs = []
+    for r, c in zip(row_ind, col_ind):
+        pair = (rows[r], cols[c])
+        if pair in scores:
+            pairs.append((pair[0], pair[1], scores[pair]))
+    
+    return sorted(pairs)
+
+
+def greedy_matches(scores: Dict[Tuple[int, int], float]) -> List[Tuple[int, int, float]]:
+    """Assign each error of tool 1, in order, its best unmatched candidate."""
+    candidates = defaultdict(list)
+    for (idx1, idx2), score in sorted(scores.items()):
+        candidates[idx1].append((idx2, score))
+    
+    matched_indices_2 = set()
+    pairs = []
+    
+    for idx1 in sorted(candidates):
+        best_idx = -1
+        best_score = 0.0
+        
+        for idx2, score in candidates[idx1]:
+            if idx2 not in matched_indices_2 and score > best_score:
+                best_score = score
+                best_idx = idx2
+        
+        if best_idx >= 0:
+            pairs.append((idx1, best_idx, best_score))
+            matched_indices_2.add(best_idx)
+    
+    return pairs
+
+
 def load_tool_results(results_dir: Path, tool_name: str) -> Dict[str, Any]:
     """Load results for a specific tool."""
     tool_dir = results_dir / tool_name
-    if not tool_dir.exists():
+    try:
+        with os.scandir(tool_dir) as entries:
+            result_files = [
+                entry.path for entry in entries
+                if entry.name.endswith(('.json', '.jsonl')) and entry.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
         return {}
     
+    if len(result_files) >= PARALLEL_LOAD_MIN_FILES and (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor() as executor:
+            parsed = list(executor.map(parse_result_file, result_files, chunksize=32))
+    else:
+        parsed = [parse_result_file(result_file) for result_file in result_files]
+    
     results = {}
-    for result_file in tool_dir.glob('*.json'):
+    for result_file, data, warning in parsed:
+        if warning:
+            print(warning, file=sys.stderr)
+        if data is None:
+            continue
         try:
-            with open(result_file, 'r') as f:
-                content = f.read().strip()
-                if not content:
-                    continue
-                data = json.loads(content)
-                # Handle both single file results and arrays
-                if isinstance(data, list):
-                    for item in data:
-                        file_path = item.get('file', '')
-                        if file_path and 'error' not in item:
-                            results[file_path] = item
-                else:
-                    file_path = data.get('file', '')
-                    # Skip results with errors (tool not found, etc.)
-                    if file_path and 'error' not in data:
-                        results[file_path] = data
-        except json.JSONDecodeError as e:
-            print(f"Warning: Invalid JSON in {result_file}: {e}", file=sys.stderr)
-            # Try to see what's in the file
-            try:
-                with open(result_file, 'r') as f:
-                    preview = f.read(200)
-                    print(f"  Preview: {preview}", file=sys.stderr)
-            except:
-                pass
+            # Handle both single file results and arrays
+            if isinstance(data, list):
+                for item in data:
+                    file_path = item.get('file', '')
+                    if file_path and 'error' not in item:
+                        results[file_path] = item
+            else:
+                file_path = data.get('file', '')
+                # Skip results with errors (tool not found, etc.)
+                if file_path and 'error' not in data:
+                    results[file_path] = data
         except Exception as e:
             print(f"Warning: Failed to load {result_file}: {e}", file=sys.stderr)
     
     return results
 
 
+def parse_result_file(result_file: str) -> Tuple[str, Any, Optional[str]]:
+    """
+    Parse a single result file. JSON Lines files (*.jsonl) hold one result
+    per line and are returned as a list of results.
+    Returns: (result_file, data or None, warning or None)
+    """
+    try:
+        if result_file.endswith('.jsonl'):
+            return parse_result_chunk(result_file)
+        
+        with open(result_file, 'rb') as f:
+            if orjson is not None and os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as view:
+                        return result_file, orjson.loads(view), None
+            content = f.read()
+        if not content or content.isspace():
+            return result_file, None, None
+        return result_file, json_loads(content), None
+    except json.JSONDecodeError as e:
+        warning = f"Warning: Invalid JSON in {result_file}: {e}"
+        # Try to see what's in the file
+        try:
+            with open(result_file, 'r') as f:
+                preview = f.read(200)
+                warning += f"\n  Preview: {preview}"
+        except:
+            pass
+        return result_file, None, warning
+    except Exception as e:
+        return result_file, None, f"Warning: Failed to load {result_file}: {e}"
+
+
+def parse_result_chunk(result_file: str) -> Tuple[str, Any, Optional[str]]:
+    """
+    Parse a JSON Lines chunk of results, skipping lines that are not valid JSON.
+    Returns: (result_file, results or None, warning or None)
+    """
+    data = []
+    warnings = []
+    with open(result_file, 'rb') as f:
+        for line_number, line in enumerate(f, 1):
+            if line.isspace():
+                continue
+            try:
+                data.append(json_loads(line))
+            except json.JSONDecodeError as e:
+                warnings.append(f"Warning: Invalid JSON in {result_file} line {line_number}: {e}")
+    return result_file, data or None, '\n'.join(warnings) or None
+
+
+def json_loads(content: bytes) -> Any:
+    """Parse JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def write_json(data: Any, f: BinaryIO) -> None:
+    """
+    Write JSON with 2-space indentation to a binary stream.
+    orjson encodes straight to bytes; the stdlib fallback streams encoder
+    chunks instead of building the whole document as one string.
+    """
+    if orjson is not None:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    
+    text = io.TextIOWrapper(f, encoding='utf-8')
+    json.dump(data, text, indent=2)
+    text.flush()
+    text.detach()
+
+
+def compare_file(
+    truss_columns: ErrorColumns,
+    competitor_columns: Dict[str, ErrorColumns]
+) -> Dict[str, Dict[str, Any]]:
+    """Compare Truss errors in one file against each competitor's."""
+    comparison_data = {}
+    
+    for competitor, comp_columns in competitor_columns.items():
+        comp_error_count = len(comp_columns[0])
+        common, unique_truss, unique_comp = match_error_columns(
+            truss_columns, comp_columns
+        )
+        n_common = len(common)
+        
+        comparison_data[competitor] = {
+            'errors_in_common': n_common,
+            'unique_to_truss': len(unique_truss),
+            'unique_to_competitor': len(unique_comp),
+            'truss_coverage': n_common / comp_error_count if comp_error_count else 1.0
+        }
+    
+    return comparison_data
+
+
 def compare_results(results_dir: str, output_file: str = None) -> Dict[str, Any]:
     """Compare validation results across all tools."""
     results_path = Path(results_dir)
@@ -169,97 +482,96 @@ def compare_results(results_dir: str, output_file: str = None) -> Dict[str, Any]
             print(f"Warning: No valid results found for {tool}", file=sys.stderr)
     
     # Get all files that were analyzed
-    all_files = set()
-    for tool_data in tool_results.values():
-        all_files.update(tool_data.keys())
+    all_files = set().union(*tool_results.values())
     
-    # Compare results file by file
-    file_comparisons = []
-    tool_stats = {tool: {
-        'errors_found': 0,
-        'files_analyzed': 0,
-        'total_time_ms': 0.0,
-        'avg_time_ms': 0.0
-    } for tool in tools}
-    
-    for file_path in sorted(all_files):
-        file_comparison = {
-            'path': file_path,
-            'tools': {},
-            'comparison': {}
+    # Filter each tool's diagnostics to errors and normalize them once
+    tool_errors = {}
+    for tool in tools:
+        tool_errors[tool] = {
+            file_path: error_columns(result.get('diagnostics', []), file_path)
+            for file_path, result in tool_results[tool].items()
         }
-        
-        # Collect errors from each tool
-        tool_errors = {}
-        for tool in tools:
-            if file_path in tool_results[tool]:
-                result = tool_results[tool][file_path]
-                errors = result.get('diagnostics', [])
-                # Filter to only errors (not warnings/info)
-                errors = [
-                    e for e in errors
-                    if e.get('severity', 'error').lower() == 'error'
-                ]
-                tool_errors[tool] = errors
-                
-                # Update stats
-                tool_stats[tool]['errors_found'] += len(errors)
-                tool_stats[tool]['files_analyzed'] += 1
-                tool_stats[tool]['total_time_ms'] += result.get('duration_ms', 0.0)
-                
-                file_comparison['tools'][tool] = {
-                    'errors': len(errors),
+    
+    # Calculate summary statistics as whole-column reductions per tool
+    tool_stats = {}
+    for tool in tools:
+        results = tool_results[tool]
+        files_analyzed = len(results)
+        # Summed in path order, as the per-file loop did, so totals don't
+        # depend on directory listing order
+        total_time_ms = sum(
+            (results[file_path].get('duration_ms', 0.0) for file_path in sorted(results)),
+            0.0
+        )
+        tool_stats[tool] = {
+            'errors_found': sum(len(columns[0]) for columns in tool_errors[tool].values()),
+            'files_analyzed': files_analyzed,
+            'total_time_ms': total_time_ms,
+            'avg_time_ms': total_time_ms / files_analyzed if files_analyzed > 0 else 0.0
+        }
+    
+    # Compare results file by file, with per-tool lookups bound up front
+    competitors = ['actionlint', 'yamllint', 'yaml-language-server']
+    tool_tables = [(tool, tool_results[tool], tool_errors[tool]) for tool in tools]
+    competitor_errors = [
+        (competitor, tool_errors[competitor])
+        for competitor in competitors if competitor in tool_errors
+    ]
+    truss_errors = tool_errors['truss']
+    # Sorted once so output is stable across runs; reports show the first files
+    sorted_files = sorted(all_files)
+    
+    # Error matching is independent per file and CPU-bound, so large corpora
+    # are spread across processes; map() keeps results in file order
+    truss_args = [truss_errors.get(file_path, EMPTY_COLUMNS) for file_path in sorted_files]
+    competitor_args = [
+        {competitor: errors_by_file.get(file_path, EMPTY_COLUMNS)
+         for competitor, errors_by_file in competitor_errors}
+        for file_path in sorted_files
+    ]
+    if len(sorted_files) >= PARALLEL_COMPARE_MIN_FILES and (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(
+            initializer=load_message_pool, initargs=(MESSAGES_BY_ID,)
+        ) as executor:
+            comparisons = list(executor.map(
+                compare_file, truss_args, competitor_args, chunksize=16
+            ))
+    else:
+        comparisons = map(compare_file, truss_args, competitor_args)
+    
+    common_totals = dict.fromkeys(competitors, 0)
+    file_comparisons = []
+    
+    for file_path, comparison_data in zip(sorted_files, comparisons):
+        file_tools = {}
+        for tool, results, errors_by_file in tool_tables:
+            result = results.get(file_path)
+            if result is not None:
+                file_tools[tool] = {
+                    'errors': len(errors_by_file[file_path][0]),
                     'duration_ms': result.get('duration_ms', 0.0),
                     'valid': result.get('valid', True)
                 }
             else:
-                tool_errors[tool] = []
-                file_comparison['tools'][tool] = {
-                    'errors': 0,
-                    'duration_ms': 0.0,
-                    'valid': True
-                }
-        
-        # Compare Truss against each competitor
-        truss_errors = tool_errors.get('truss', [])
-        comparison_data = {}
+                file_tools[tool] = {'errors': 0, 'duration_ms': 0.0, 'valid': True}
         
-        for competitor in ['actionlint', 'yamllint', 'yaml-language-server']:
-            if competitor not in tool_errors:
-                continue
-            
-            comp_errors = tool_errors[competitor]
-            common, unique_truss, unique_comp = match_errors(
-                truss_errors, comp_errors, file_path
-            )
-            
-            comparison_data[competitor] = {
-                'errors_in_common': len(common),
-                'unique_to_truss': len(unique_truss),
-                'unique_to_competitor': len(unique_comp),
-                'truss_coverage': len(common) / len(comp_errors) if comp_errors else 1.0
-            }
+        for competitor, data in comparison_data.items():
+            common_totals[competitor] += data['errors_in_common']
         
-        file_comparison['comparison'] = comparison_data
-        file_comparisons.append(file_comparison)
-    
-    # Calculate summary statistics
-    for tool in tools:
-        stats = tool_stats[tool]
-        if stats['files_analyzed'] > 0:
-            stats['avg_time_ms'] = stats['total_time_ms'] / stats['files_analyzed']
+        file_comparisons.append({
+            'path': file_path,
+            'tools': file_tools,
+            'comparison': comparison_data
+        })
     
     # Overall coverage analysis
     coverage_analysis = {}
-    for competitor in ['actionlint', 'yamllint', 'yaml-language-server']:
+    for competitor in competitors:
         if competitor not in tool_results:
             continue
         
         total_comp_errors = tool_stats[competitor]['errors_found']
-        total_common = sum(
-            fc['comparison'].get(competitor, {}).get('errors_in_common', 0)
-            for fc in file_comparisons
-        )
+        total_common = common_totals[competitor]
         
         coverage_analysis[competitor] = {
             'total_errors': total_comp_errors,
@@ -285,14 +597,15 @@ def compare_results(results_dir: str, output_file: str = None) -> Dict[str, Any]
     }
     
     # Output result
-    output_json = json.dumps(result, indent=2)
-    
     if output_file:
-        with open(output_file, 'w') as f:
-            f.write(output_json)
+        with open(output_file, 'wb') as f:
+            write_json(result, f)
         print(f"Comparison results written to: {output_file}", file=sys.stderr)
     else:
-        print(output_json)
+        sys.stdout.flush()
+        write_json(result, sys.stdout.buffer)
+        sys.stdout.buffer.write(b'\n')
+        sys.stdout.buffer.flush()
     
     return result
 
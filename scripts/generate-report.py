@@ -10,74 +10,155 @@ import os
 from pathlib import Path
 from typing import Dict, Any
 
+try:
+    import ijson
+except ImportError:
+    # ijson is optional; without it the whole comparison file is parsed
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; without it the stdlib json module is used
+    orjson = None
+
+# Number of files listed in the file-by-file breakdown
+REPORT_FILE_LIMIT = 20
+
+
+def load_comparison(comparison_file: str) -> Dict[str, Any]:
+    """
+    Load comparison data for reporting.
+    Only the first REPORT_FILE_LIMIT entries of 'files' are kept; the total
+    number of files is stored under 'files_total'.
+    """
+    with open(comparison_file, 'rb') as f:
+        if ijson is not None:
+            return stream_comparison(f)
+        
+        content = f.read()
+        comparison_data = orjson.loads(content) if orjson is not None else json.loads(content)
+    
+    files = comparison_data.get('files', [])
+    comparison_data['files'] = files[:REPORT_FILE_LIMIT]
+    comparison_data['files_total'] = len(files)
+    return comparison_data
+
+
+def stream_comparison(f) -> Dict[str, Any]:
+    """Single-pass ijson load that never materializes the full 'files' list."""
+    comparison_data = {}
+    files = []
+    files_total = 0
+    key = None
+    builder = None
+    file_builder = None
+    
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if prefix == '':
+            # Top-level value finished (next key or end of document)
+            if builder is not None:
+                comparison_data[key] = builder.value
+                builder = None
+            if event == 'map_key':
+                key = value
+                if key != 'files':
+                    builder = ijson.ObjectBuilder()
+            continue
+        
+        if builder is not None:
+            builder.event(event, value)
+        elif prefix == 'files.item' and event == 'start_map':
+            files_total += 1
+            if files_total <= REPORT_FILE_LIMIT:
+                file_builder = ijson.ObjectBuilder()
+                file_builder.event(event, value)
+        elif file_builder is not None and prefix.startswith('files.item'):
+            file_builder.event(event, value)
+            if prefix == 'files.item' and event == 'end_map':
+                files.append(file_builder.value)
+                file_builder = None
+    
+    comparison_data['files'] = files
+    comparison_data['files_total'] = files_total
+    return comparison_data
+
 
 def generate_markdown_report(comparison_data: Dict[str, Any], output_dir: Path) -> None:
     """Generate Markdown report from comparison data."""
     report_path = output_dir / 'summary.md'
     
-    with open(report_path, 'w') as f:
-        f.write("# Validation Tool Comparison Report\n\n")
-        f.write(f"**Generated:** {comparison_data.get('timestamp', 'Unknown')}\n\n")
-        
-        # Summary section
-        f.write("## Summary\n\n")
-        summary = comparison_data.get('summary', {})
-        f.write(f"- **Total Files Analyzed:** {summary.get('total_files', 0)}\n")
-        f.write(f"- **Total Errors (Truss):** {summary.get('total_errors_truss', 0)}\n")
-        f.write(f"- **Total Errors (actionlint):** {summary.get('total_errors_actionlint', 0)}\n")
-        f.write(f"- **Truss Coverage:** {summary.get('coverage_truss', 0.0):.1%}\n")
-        f.write(f"- **Avg Time (Truss):** {summary.get('avg_time_truss_ms', 0.0):.2f}ms\n")
-        f.write(f"- **Avg Time (actionlint):** {summary.get('avg_time_actionlint_ms', 0.0):.2f}ms\n")
-        f.write(f"- **Speedup:** {summary.get('avg_time_actionlint_ms', 1.0) / max(summary.get('avg_time_truss_ms', 0.1), 0.1):.1f}x\n\n")
-        
-        # Coverage Analysis
-        f.write("## Coverage Analysis\n\n")
-        coverage = comparison_data.get('coverage_analysis', {})
-        for tool, data in coverage.items():
-            f.write(f"### {tool}\n\n")
-            f.write(f"- **Total Errors:** {data.get('total_errors', 0)}\n")
-            f.write(f"- **Truss Found:** {data.get('truss_found', 0)}\n")
-            f.write(f"- **Coverage:** {data.get('coverage', 0.0):.1%}\n\n")
-        
-        # Tool Statistics
-        f.write("## Tool Statistics\n\n")
-        tools = comparison_data.get('tools', {})
-        f.write("| Tool | Files Analyzed | Errors Found | Avg Time (ms) | Total Time (ms) |\n")
-        f.write("|------|----------------|--------------|---------------|-----------------|\n")
-        
-        for tool, stats in tools.items():
-            f.write(f"| {tool} | {stats.get('files_analyzed', 0)} | "
-                   f"{stats.get('errors_found', 0)} | "
-                   f"{stats.get('avg_time_ms', 0.0):.2f} | "
-                   f"{stats.get('total_time_ms', 0.0):.2f} |\n")
-        f.write("\n")
-        
-        # File-by-File Breakdown
-        f.write("## File-by-File Breakdown\n\n")
-        files = comparison_data.get('files', [])
+    parts = ["# Validation Tool Comparison Report\n\n"]
+    parts.append(f"**Generated:** {comparison_data.get('timestamp', 'Unknown')}\n\n")
+    
+    # Summary section
+    summary = comparison_data.get('summary', {})
+    parts.append(
+        "## Summary\n\n"
+        f"- **Total Files Analyzed:** {summary.get('total_files', 0)}\n"
+        f"- **Total Errors (Truss):** {summary.get('total_errors_truss', 0)}\n"
+        f"- **Total Errors (actionlint):** {summary.get('total_errors_actionlint', 0)}\n"
+        f"- **Truss Coverage:** {summary.get('coverage_truss', 0.0):.1%}\n"
+        f"- **Avg Time (Truss):** {summary.get('avg_time_truss_ms', 0.0):.2f}ms\n"
+        f"- **Avg Time (actionlint):** {summary.get('avg_time_actionlint_ms', 0.0):.2f}ms\n"
+        f"- **Speedup:** {summary.get('avg_time_actionlint_ms', 1.0) / max(summary.get('avg_time_truss_ms', 0.1), 0.1):.1f}x\n\n"
+    )
+    
+    # Coverage Analysis
+    parts.append("## Coverage Analysis\n\n")
+    coverage = comparison_data.get('coverage_analysis', {})
+    for tool, data in coverage.items():
+        parts.append(
+            f"### {tool}\n\n"
+            f"- **Total Errors:** {data.get('total_errors', 0)}\n"
+            f"- **Truss Found:** {data.get('truss_found', 0)}\n"
+            f"- **Coverage:** {data.get('coverage', 0.0):.1%}\n\n"
+        )
+    
+    # Tool Statistics
+    parts.append(
+        "## Tool Statistics\n\n"
+        "| Tool | Files Analyzed | Errors Found | Avg Time (ms) | Total Time (ms) |\n"
+        "|------|----------------|--------------|---------------|-----------------|\n"
+    )
+    tools = comparison_data.get('tools', {})
+    for tool, stats in tools.items():
+        parts.append(f"| {tool} | {stats.get('files_analyzed', 0)} | "
+                     f"{stats.get('errors_found', 0)} | "
+                     f"{stats.get('avg_time_ms', 0.0):.2f} | "
+                     f"{stats.get('total_time_ms', 0.0):.2f} |\n")
+    parts.append("\n")
+    
+    # File-by-File Breakdown
+    parts.append("## File-by-File Breakdown\n\n")
+    files = comparison_data.get('files', [])
+    files_total = comparison_data.get('files_total', len(files))
+    
+    for file_data in files[:REPORT_FILE_LIMIT]:
+        parts.append(f"### {file_data.get('path', 'Unknown')}\n\n")
         
-        for file_data in files[:20]:  # Limit to first 20 files
-            f.write(f"### {file_data.get('path', 'Unknown')}\n\n")
-            
-            # Tool results
-            f.write("**Tool Results:**\n")
-            for tool, tool_data in file_data.get('tools', {}).items():
-                f.write(f"- **{tool}:** {tool_data.get('errors', 0)} errors, "
-                       f"{tool_data.get('duration_ms', 0.0):.2f}ms\n")
-            f.write("\n")
-            
-            # Comparison
-            comparison = file_data.get('comparison', {})
-            if comparison:
-                f.write("**Comparison:**\n")
-                for comp_tool, comp_data in comparison.items():
-                    f.write(f"- vs **{comp_tool}:** {comp_data.get('errors_in_common', 0)} common, "
-                           f"{comp_data.get('unique_to_truss', 0)} unique to Truss, "
-                           f"{comp_data.get('unique_to_competitor', 0)} unique to {comp_tool}\n")
-            f.write("\n")
+        # Tool results
+        parts.append("**Tool Results:**\n")
+        for tool, tool_data in file_data.get('tools', {}).items():
+            parts.append(f"- **{tool}:** {tool_data.get('errors', 0)} errors, "
+                         f"{tool_data.get('duration_ms', 0.0):.2f}ms\n")
+        parts.append("\n")
         
-        if len(files) > 20:
-            f.write(f"\n*... and {len(files) - 20} more files*\n")
+        # Comparison
+        comparison = file_data.get('comparison', {})
+        if comparison:
+            parts.append("**Comparison:**\n")
+            for comp_tool, comp_data in comparison.items():
+                parts.append(f"- vs **{comp_tool}:** {comp_data.get('errors_in_common', 0)} common, "
+                             f"{comp_data.get('unique_to_truss', 0)} unique to Truss, "
+                             f"{comp_data.get('unique_to_competitor', 0)} unique to {comp_tool}\n")
+        parts.append("\n")
+    
+    if files_total > REPORT_FILE_LIMIT:
+        parts.append(f"\n*... and {files_total - REPORT_FILE_LIMIT} more files*\n")
+    
+    with open(report_path, 'w') as f:
+        f.write(''.join(parts))
     
     print(f"Markdown report written to: {report_path}", file=sys.stderr)
 
@@ -90,7 +171,7 @@ def generate_html_report(comparison_data: Dict[str, Any], output_dir: Path) -> N
     tools = comparison_data.get('tools', {})
     coverage = comparison_data.get('coverage_analysis', {})
     
-    html = f"""<!DOCTYPE html>
+    parts = [f"""<!DOCTYPE html>
 <html>
 <head>
     <title>Validation Tool Comparison Report</title>
@@ -128,20 +209,20 @@ def generate_html_report(comparison_data: Dict[str, Any], output_dir: Path) -> N
             <th>Truss Found</th>
             <th>Coverage</th>
         </tr>
-"""
+"""]
     
     for tool, data in coverage.items():
         cov = data.get('coverage', 0.0)
         cov_class = 'coverage-good' if cov >= 0.9 else 'coverage-medium' if cov >= 0.7 else 'coverage-poor'
-        html += f"""        <tr>
+        parts.append(f"""        <tr>
             <td>{tool}</td>
             <td>{data.get('total_errors', 0)}</td>
             <td>{data.get('truss_found', 0)}</td>
             <td class="{cov_class}">{cov:.1%}</td>
         </tr>
-"""
+""")
     
-    html += """    </table>
+    parts.append("""    </table>
     
     <h2>Tool Statistics</h2>
     <table>
@@ -152,25 +233,25 @@ def generate_html_report(comparison_data: Dict[str, Any], output_dir: Path) -> N
             <th>Avg Time (ms)</th>
             <th>Total Time (ms)</th>
         </tr>
-"""
+""")
     
     for tool, stats in tools.items():
-        html += f"""        <tr>
+        parts.append(f"""        <tr>
             <td>{tool}</td>
             <td>{stats.get('files_analyzed', 0)}</td>
             <td>{stats.get('errors_found', 0)}</td>
             <td>{stats.get('avg_time_ms', 0.0):.2f}</td>
             <td>{stats.get('total_time_ms', 0.0):.2f}</td>
         </tr>
-"""
+""")
     
-    html += """    </table>
+    parts.append("""    </table>
 </body>
 </html>
-"""
+""")
     
     with open(report_path, 'w') as f:
-        f.write(html)
+        f.write(''.join(parts))
     
     print(f"HTML report written to: {report_path}", file=sys.stderr)
 
@@ -189,8 +270,7 @@ if __name__ == '__main__':
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    with open(comparison_file, 'r') as f:
-        comparison_data = json.load(f)
+    comparison_data = load_comparison(comparison_file)
     
     generate_markdown_report(comparison_data, output_dir)
     generate_html_report(comparison_data, output_dir)